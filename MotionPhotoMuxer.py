@@ -47,15 +47,16 @@ def validate_media(photo_path: Path, video_path: Path):
         return False
     return True
 
-def merge_files(photo_path: Path, video_path: Path, output_path: Path) -> Path:
+def merge_files(photo_path: Path, video_path: Path, output_path: Path, out_name: str = None) -> Path:
     """Merges the photo and video file together by concatenating the video at the end of the photo. Writes the output to
     a temporary folder.
     :param photo_path: Path to the photo
     :param video_path: Path to the video
+    :param out_name: optional file name for the merged output; defaults to the photo's name
     :return: File name of the merged output file
     """
     logging.info("Merging {} and {}.".format(photo_path, video_path))
-    out_path = output_path / photo_path.name
+    out_path = output_path / (out_name or photo_path.name)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with open(out_path, "wb") as outfile, open(photo_path, "rb") as photo, open(video_path, "rb") as video:
         outfile.write(photo.read())
@@ -64,6 +65,24 @@ def merge_files(photo_path: Path, video_path: Path, output_path: Path) -> Path:
     return out_path
 
 
+def merge_bytes(photo_bytes: bytes, video_path: Path, output_path: Path, name: str) -> Path:
+    """Like merge_files, but takes the photo as in-memory encoded JPEG bytes so
+    callers that already hold the data avoid a temp-file write and re-read.
+    :param photo_bytes: encoded JPEG data of the photo
+    :param video_path: Path to the video
+    :param name: file name to write inside the output directory
+    :return: File name of the merged output file
+    """
+    logging.info("Merging in-memory photo and {}.".format(video_path))
+    out_path = output_path / name
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "wb") as outfile, open(video_path, "rb") as video:
+        outfile.write(photo_bytes)
+        outfile.write(video.read())
+    logging.info("Merged photo and video.")
+    return out_path
+
+
 def _add_xmp_metadata_pyexiv2(merged_file: Path, offset: int):
     """Adds XMP metadata to the merged image indicating the byte offset in the file where the video begins.
     :param merged_file: The path to the file that has the photo and video merged together.
@@ -135,14 +154,15 @@ def add_xmp_metadata(merged_file: Path, offset: int):
         _add_xmp_metadata_exiftool(merged_file, offset)
 
 
-def convert(photo_path: Path, video_path: Path, output_path: Path):
+def convert(photo_path: Path, video_path: Path, output_path: Path, out_name: str = None):
     """
     Performs the conversion process to mux the files together into a Google Motion Photo.
     :param photo_path: path to the photo to merge
     :param video_path: path to the video to merge
+    :param out_name: optional file name for the merged output; defaults to the photo's name
     :return: True if conversion was successful, else False
     """
-    merged = merge_files(photo_path, video_path, output_path)
+    merged = merge_files(photo_path, video_path, output_path, out_name)
     photo_filesize = photo_path.stat().st_size
     merged_filesize = merged.stat().st_size
 
@@ -151,6 +171,19 @@ def convert(photo_path: Path, video_path: Path, output_path: Path):
     offset = merged_filesize - photo_filesize
     add_xmp_metadata(merged, offset)
 
+def convert_bytes(photo_bytes: bytes, video_path: Path, output_path: Path, name: str):
+    """
+    Same as convert, but the photo is provided as in-memory JPEG bytes; the
+    video offset is known from the byte count, so the photo is never re-read
+    from disk.
+    :param photo_bytes: encoded JPEG data of the photo
+    :param video_path: path to the video to merge
+    :param name: output file name for the merged Motion Photo
+    """
+    merged = merge_bytes(photo_bytes, video_path, output_path, name)
+    offset = merged.stat().st_size - len(photo_bytes)
+    add_xmp_metadata(merged, offset)
+
 def matching_video(photo_path: Path) -> Path:
     base = str(photo_path.with_suffix(""))
     logging.info("Looking for videos named: {}".format(base))
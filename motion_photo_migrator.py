@@ -1,18 +1,28 @@
 import argparse
 import collections
+import concurrent.futures
+import functools
+import io
+import itertools
 import os
 import shutil
+import subprocess
 import sys
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 
 import logging
 
 # Local muxer
 import MotionPhotoMuxer as mux
 
+try:
+    import liburing  # type: ignore
+except Exception:
+    liburing = None
+
 
 IMAGE_EXTS = {".jpg", ".jpeg", ".heic", ".png"}
 VIDEO_EXTS = {".mov", ".mp4"}
@@ -20,71 +30,220 @@ VIDEO_EXTS = {".mov", ".mp4"}
 IMG_PRIORITY = [".jpg", ".jpeg", ".heic", ".png"]
 VID_PRIORITY = [".mov", ".mp4"]
 
+# Single-lookup classifier for the scan loop: ext -> bucket index in the
+# by_base tuple (0 = image, 1 = video). Built from the extension sets so
+# those stay the source of truth; one dict get replaces two set membership
+# tests per file.
+_EXT_KIND = {**{e: 0 for e in IMAGE_EXTS}, **{e: 1 for e in VIDEO_EXTS}}
+
+# Priority rank maps, built once instead of per choose_candidate call.
+_IMG_PRIO = {ext: i for i, ext in enumerate(IMG_PRIORITY)}
+_VID_PRIO = {ext: i for i, ext in enumerate(VID_PRIORITY)}
+
 
+# Paths are carried as plain strings (straight off DirEntry.path) until the
+# mux/copy boundary; constructing a Path per file parses and re-allocates the
+# string for no benefit during scanning and grouping.
 @dataclass
 class Pair:
     base: str
-    image: Path
-    video: Path
-    alternates_images: List[Path]
-    alternates_videos: List[Path]
+    image: str
+    video: str
+    alternates_images: List[str]
+    alternates_videos: List[str]
 
 
-def is_image(p: Path) -> bool:
-    return p.suffix.lower() in IMAGE_EXTS
+def is_image(p: str) -> bool:
+    return os.path.splitext(p)[1].lower() in IMAGE_EXTS
 
 
-def is_video(p: Path) -> bool:
-    return p.suffix.lower() in VIDEO_EXTS
+def is_video(p: str) -> bool:
+    return os.path.splitext(p)[1].lower() in VIDEO_EXTS
 
 
-def scan_directory(root: Path, recurse: bool) -> List[Path]:
-    if not root.exists() or not root.is_dir():
-        raise ValueError(f"Input directory invalid: {root}")
-    return list(root.rglob("*")) if recurse else [p for p in root.iterdir()]
+def _scan(root: Path, recurse: bool):
+    """Yield a DirEntry for every file under root using os.scandir.
 
+    DirEntry carries the file type from the directory read itself, so no
+    extra stat() per entry is needed (unlike Path.is_file()).
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            # Match rglob's skip semantics for unreadable directories
+            # (.Trashes, lost+found, other-user dirs on NAS drives).
+            continue
+        with it:
+            for e in it:
+                try:
+                    if e.is_file(follow_symlinks=False):
+                        yield e
+                    elif recurse and e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                except OSError:
+                    # Type unknown and the fallback stat failed; skip.
+                    continue
+
+
+# io_uring submission queue depth for the batched-statx scanner.
+_URING_QUEUE_DEPTH = 16384
+
+
+def _use_io_uring() -> bool:
+    # Opt-in: on filesystems that report d_type (ext4, btrfs, APFS) the plain
+    # scandir walk needs no stats at all, so batched statx only pays off where
+    # d_type is unreported (NFS, some XFS) and the user asks for it.
+    return (
+        liburing is not None
+        and sys.platform == "linux"
+        and os.environ.get("MOTIONPHOTO_IO_URING") == "1"
+    )
 
-def group_by_basename(paths: List[Path]):
-    by_base: Dict[str, Dict[str, List[Path]]] = {}
-    others: List[Path] = []
-    for p in paths:
-        if not p.is_file():
+
+def _classify_entries(entries):
+    """Split scandir entries into (file entries, subdirectory paths) using
+    the DirEntry type checks."""
+    files, dirs = [], []
+    for e in entries:
+        try:
+            if e.is_file(follow_symlinks=False):
+                files.append(e)
+            elif e.is_dir(follow_symlinks=False):
+                dirs.append(e.path)
+        except OSError:
+            # Type unknown and the fallback stat failed; skip.
             continue
-        ext = p.suffix.lower()
-        base = p.stem
-        if ext in IMAGE_EXTS or ext in VIDEO_EXTS:
-            d = by_base.setdefault(base, {"images": [], "videos": []})
-            if ext in IMAGE_EXTS:
-                d["images"].append(p)
+    return files, dirs
+
+
+def _scan_io_uring(root: Path, recurse: bool):
+    """Like _scan, but resolves entry types via statx batched through io_uring.
+
+    io_uring has no getdents opcode, so directory reads still go through
+    os.scandir; the ring is used to pipeline the per-entry stat calls that
+    DirEntry type checks would otherwise issue synchronously when the
+    filesystem does not report d_type. Any liburing failure — at ring setup
+    or mid-walk — degrades to the plain DirEntry checks for the rest of the
+    scan, so the walk always completes.
+    """
+    import stat as statmod
+
+    nofollow = getattr(liburing, "AT_SYMLINK_NOFOLLOW", 0x100)
+    statx_type = getattr(liburing, "STATX_TYPE", 0x1)
+
+    ring = liburing.io_uring()
+    try:
+        liburing.io_uring_queue_init(_URING_QUEUE_DEPTH, ring)
+    except Exception:
+        yield from _scan(root, recurse)
+        return
+
+    def _classify_statx(entries):
+        # Submit one statx per entry; the kernel gathers results while we
+        # drain completions below. Nothing is yielded from here, so a failure
+        # mid-batch never duplicates entries already handed out.
+        files, dirs = [], []
+        cqe = liburing.io_uring_cqe()
+        for batch_start in range(0, len(entries), _URING_QUEUE_DEPTH):
+            batch = entries[batch_start:batch_start + _URING_QUEUE_DEPTH]
+            bufs = liburing.statx(len(batch))
+            for i, e in enumerate(batch):
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_statx(
+                    sqe, os.fsencode(e.path), bufs[i], nofollow, statx_type
+                )
+                sqe.user_data = i
+            liburing.io_uring_submit(ring)
+            for _ in batch:
+                liburing.io_uring_wait_cqe(ring, cqe)
+                i = cqe.user_data
+                if cqe.res >= 0:
+                    mode = bufs[i].stx_mode
+                    if statmod.S_ISREG(mode):
+                        files.append(batch[i])
+                    elif statmod.S_ISDIR(mode):
+                        dirs.append(batch[i].path)
+                liburing.io_uring_cqe_seen(ring, cqe)
+        return files, dirs
+
+    ring_ok = True
+    try:
+        stack = [str(root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                # Match rglob's skip semantics for unreadable directories.
+                continue
+            if ring_ok:
+                try:
+                    files, dirs = _classify_statx(entries)
+                except Exception:
+                    ring_ok = False
+                    files, dirs = _classify_entries(entries)
             else:
-                d["videos"].append(p)
+                files, dirs = _classify_entries(entries)
+            yield from files
+            if recurse:
+                stack.extend(dirs)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+
+
+def scan_and_group(root: Path, recurse: bool):
+    """Walk root once and bucket files by basename in the same pass."""
+    if not root.exists() or not root.is_dir():
+        raise ValueError(f"Input directory invalid: {root}")
+    # base -> ([images], [videos]); a two-slot tuple avoids the inner dict
+    # allocation and string-key lookups of a {"images": [], "videos": []}
+    # bucket per unique basename.
+    by_base: Dict[str, Tuple[List[str], List[str]]] = collections.defaultdict(lambda: ([], []))
+    others: List[str] = []
+    by_ext: collections.Counter = collections.Counter()
+    scanner = _scan_io_uring if _use_io_uring() else _scan
+    for e in scanner(root, recurse):
+        # Split name/ext inline; rfind on the raw name skips the generality
+        # (and the extra allocations) of os.path.splitext per file.
+        name = e.name
+        dot = name.rfind(".")
+        if dot > 0:
+            base = name[:dot]
+            ext = name[dot:].lower()
         else:
-            others.append(p)
-    return by_base, others
+            base = name
+            ext = ""
+        by_ext[ext] += 1
+        kind = _EXT_KIND.get(ext)
+        if kind is None:
+            others.append(e.path)
+        else:
+            by_base[base][kind].append(e.path)
+    return by_base, others, by_ext
 
 
-def choose_candidate(paths: List[Path], priority: List[str]) -> Tuple[Optional[Path], List[Path]]:
+def choose_candidate(paths: List[str], prio_map: Dict[str, int]) -> Tuple[Optional[str], List[str]]:
     if not paths:
         return None, []
+    if len(paths) == 1:
+        # The overwhelmingly common case: one candidate, nothing to rank.
+        return paths[0], []
     # Sort by priority, keep first
-    prio_map = {ext: i for i, ext in enumerate(priority)}
-    sorted_paths = sorted(paths, key=lambda p: prio_map.get(p.suffix.lower(), 999))
-    chosen = sorted_paths[0]
-    alternates = [p for p in sorted_paths[1:]]
-    return chosen, alternates
+    sorted_paths = sorted(paths, key=lambda p: prio_map.get(os.path.splitext(p)[1].lower(), 999))
+    return sorted_paths[0], sorted_paths[1:]
 
 
-def build_pairs(by_base: Dict[str, Dict[str, List[Path]]]) -> Tuple[List[Pair], List[Path], List[Path], Dict[str, List[Path]]]:
+def build_pairs(by_base: Dict[str, Tuple[List[str], List[str]]]) -> Tuple[List[Pair], List[str], List[str], Dict[str, List[str]]]:
     pairs: List[Pair] = []
-    images_only: List[Path] = []
-    videos_only: List[Path] = []
-    ambiguous: Dict[str, List[Path]] = {}
-
-    for base, buckets in by_base.items():
-        imgs = buckets["images"]
-        vids = buckets["videos"]
-        img, img_alts = choose_candidate(imgs, IMG_PRIORITY)
-        vid, vid_alts = choose_candidate(vids, VID_PRIORITY)
+    images_only: List[str] = []
+    videos_only: List[str] = []
+    ambiguous: Dict[str, List[str]] = {}
+
+    for base, (imgs, vids) in by_base.items():
+        img, img_alts = choose_candidate(imgs, _IMG_PRIO)
+        vid, vid_alts = choose_candidate(vids, _VID_PRIO)
         if img and vid:
             pairs.append(Pair(base=base, image=img, video=vid, alternates_images=img_alts, alternates_videos=vid_alts))
             if img_alts or vid_alts:
@@ -100,10 +259,9 @@ def build_pairs(by_base: Dict[str, Dict[str, List[Path]]]) -> Tuple[List[Pair],
     return pairs, images_only, videos_only, ambiguous
 
 
-def summarize(paths: List[Path], pairs: List[Pair], images_only: List[Path], videos_only: List[Path], others: List[Path], ambiguous: Dict[str, List[Path]]):
-    by_ext = collections.Counter(p.suffix.lower() for p in paths if p.is_file())
+def summarize(by_ext: collections.Counter, pairs: List[Pair], images_only: List[str], videos_only: List[str], others: List[str], ambiguous: Dict[str, List[str]]):
     print("Summary:")
-    print(f"  Total files: {len(paths)}")
+    print(f"  Total files: {sum(by_ext.values())}")
     print("  By extension:")
     for ext, cnt in sorted(by_ext.items()):
         print(f"    {ext or '<noext>'}: {cnt}")
@@ -114,19 +272,20 @@ def summarize(paths: List[Path], pairs: List[Pair], images_only: List[Path], vid
     print(f"  Ambiguous basenames (multiple candidates): {len(ambiguous)}")
 
 
-def list_details(pairs: List[Pair], images_only: List[Path], videos_only: List[Path], others: List[Path], ambiguous: Dict[str, List[Path]]):
-    def _print_list(title: str, items: List[Path]):
+def list_details(pairs: List[Pair], images_only: List[str], videos_only: List[str], others: List[str], ambiguous: Dict[str, List[str]]):
+    def _print_list(title: str, items: List[str]):
         print(f"\n{title} ({len(items)}):")
+        # Items are plain strings, so this is a direct string sort.
         for p in sorted(items):
             print(f"  {p}")
 
     print("\nPairs (image + video):")
     for pr in pairs:
-        print(f"  {pr.base}: {pr.image.name} + {pr.video.name}")
+        print(f"  {pr.base}: {os.path.basename(pr.image)} + {os.path.basename(pr.video)}")
         if pr.alternates_images:
-            print(f"    alt images: {[p.name for p in pr.alternates_images]}")
+            print(f"    alt images: {[os.path.basename(p) for p in pr.alternates_images]}")
         if pr.alternates_videos:
-            print(f"    alt videos: {[p.name for p in pr.alternates_videos]}")
+            print(f"    alt videos: {[os.path.basename(p) for p in pr.alternates_videos]}")
 
     _print_list("Images without video", images_only)
     _print_list("Videos without image", videos_only)
@@ -134,91 +293,239 @@ def list_details(pairs: List[Pair], images_only: List[Path], videos_only: List[P
 
     print(f"\nAmbiguous basenames ({len(ambiguous)}):")
     for base, alts in sorted(ambiguous.items()):
-        print(f"  {base}: {[p.name for p in alts]}")
+        print(f"  {base}: {[os.path.basename(p) for p in alts]}")
 
 
 def ensure_dir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
 
+@functools.lru_cache(maxsize=None)
 def has_cmd(cmd: str) -> bool:
-    from shutil import which
-    return which(cmd) is not None
+    # Cached: walking $PATH stats every entry, and this runs per conversion.
+    return shutil.which(cmd) is not None
 
 
-def convert_image_to_jpeg(src: Path, dest_dir: Path) -> Path:
+def convert_image_to_jpeg(src: Path, dest_dir: Path) -> Union[Path, bytes]:
+    """Convert src to JPEG, returning either encoded bytes (in-process
+    decoders) or a path under dest_dir (external sips/ffmpeg)."""
     ensure_dir(dest_dir)
     out = dest_dir / (src.stem + ".jpg")
     ext = src.suffix.lower()
 
     if ext in {".jpg", ".jpeg"}:
-        # Already JPEG; just copy to dest and use that path
-        shutil.copy2(src, out)
+        # Already JPEG; the temp copy is read-only, so a hardlink (or a
+        # reflink via copy_file_range on CoW filesystems) avoids moving the
+        # bytes through userspace at all.
+        out.unlink(missing_ok=True)
+        try:
+            os.link(src, out)
+            return out
+        except OSError:
+            pass
+        if hasattr(os, "copy_file_range"):
+            try:
+                with open(src, "rb") as fin, open(out, "wb") as fout:
+                    remaining = os.fstat(fin.fileno()).st_size
+                    while remaining > 0:
+                        sent = os.copy_file_range(fin.fileno(), fout.fileno(), remaining)
+                        if sent == 0:
+                            break
+                        remaining -= sent
+                return out
+            except OSError:
+                pass
+        shutil.copyfile(src, out)
         return out
 
+    # Fastest path for HEIC: libvips decodes in-process through libheif,
+    # which parallelizes across HEIF tiles — no subprocess launch per image.
+    try:
+        os.environ.setdefault("VIPS_CONCURRENCY", str(os.cpu_count() or 1))
+        import pyvips  # type: ignore
+        return pyvips.Image.new_from_file(str(src), access="sequential").write_to_buffer(".jpg", Q=95)
+    except Exception:
+        pass
+
     # Prefer macOS sips for HEIC/PNG
     if has_cmd("sips"):
-        rc = os.system(f"sips -s format jpeg {src.as_posix()} --out {out.as_posix()} >/dev/null 2>&1")
-        if rc == 0 and out.exists():
+        cp = subprocess.run(
+            ["sips", "-s", "format", "jpeg", str(src), "--out", str(out)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False,
+        )
+        if cp.returncode == 0 and out.exists():
             return out
 
     # Fallback to Pillow (PNG likely; HEIC may not be supported)
     try:
-        from PIL import Image  # type: ignore
+        Image = _PIL_IMAGE
+        if Image is None:
+            from PIL import Image  # type: ignore
         with Image.open(src) as im:
-            rgb = im.convert("RGB")
-            rgb.save(out, format="JPEG", quality=95)
-            return out
+            # convert("RGB") allocates a second full-resolution buffer;
+            # skip it when the source already decodes to RGB.
+            rgb = im if im.mode == "RGB" else im.convert("RGB")
+            buf = io.BytesIO()
+            rgb.save(buf, format="JPEG", quality=95, optimize=False, progressive=False)
+            return buf.getvalue()
     except Exception:
         pass
 
     # Fallback to ffmpeg
     if has_cmd("ffmpeg"):
-        rc = os.system(f"ffmpeg -y -i {src.as_posix()} -q:v 2 {out.as_posix()} >/dev/null 2>&1")
-        if rc == 0 and out.exists():
+        cp = subprocess.run(
+            ["ffmpeg", "-y", "-i", str(src), "-q:v", "2", str(out)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False,
+        )
+        if cp.returncode == 0 and out.exists():
             return out
 
     raise RuntimeError(f"Failed to convert {src} to JPEG; install 'sips' (macOS), Pillow, or ffmpeg.")
 
 
-def perform_migration(pairs: List[Pair], images_only: List[Path], videos_only: List[Path], others: List[Path], output: Path, overwrite: bool = True):
-    ensure_dir(output)
+def _copy_file(src: str, dest: Path):
+    """Copy src to dest, preferring zero-copy paths over shutil.copy2.
+
+    A hardlink is free when src and dest share a filesystem; across devices,
+    os.sendfile moves the bytes kernel-side without a userspace buffer.
+    shutil.copy2 remains the portable fallback (e.g. sendfile to a regular
+    file is Linux-only).
+    """
+    try:
+        os.link(src, dest)
+        return
+    except FileExistsError:
+        # dest may be a previous run's hardlink to src; truncating it would
+        # zero the source through the shared inode. If they are already the
+        # same file there is nothing to do, otherwise replace the old dest
+        # and retry the link before falling through to a real copy.
+        try:
+            if os.path.samefile(src, dest):
+                return
+        except OSError:
+            pass
+        dest.unlink(missing_ok=True)
+        try:
+            os.link(src, dest)
+            return
+        except OSError:
+            pass
+    except OSError:
+        pass
+    try:
+        with open(src, "rb") as fin, open(dest, "wb") as fout:
+            size = os.fstat(fin.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(fout.fileno(), fin.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        shutil.copystat(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+# Conversion scratch space: prefer tmpfs on Linux so intermediate JPEGs
+# live in RAM and never hit the disk the outputs are being written to.
+_SCRATCH_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+# Pillow's Image module, pre-imported once per pool worker by _init_worker
+# so each worker pays the import cost a single time, not per conversion.
+_PIL_IMAGE = None
+
+
+def _init_worker():
+    global _PIL_IMAGE
+    try:
+        from PIL import Image  # type: ignore
+        _PIL_IMAGE = Image
+    except Exception:
+        _PIL_IMAGE = None
+
+
+# Per-pair statuses returned by _process_pair.
+PAIR_MIGRATED = "migrated"
+PAIR_SKIPPED = "skipped"
+PAIR_FAILED = "failed"
+
+
+def _process_pair(pr: Pair, output: Path, overwrite: bool) -> str:
+    """Convert one pair's image to JPEG and mux it. Safe to run in a worker
+    process: each call uses its own temp directory so workers never contend
+    on the same files."""
     log = logging.getLogger("migrator")
-    migrated = 0
-    copied = 0
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp = Path(tmpdir)
-        for pr in pairs:
-            # Convert image to JPEG (if needed) into temp
-            try:
-                jpeg = convert_image_to_jpeg(pr.image, tmp)
-            except Exception as e:
-                log.error(f"Skipping pair {pr.base}: cannot convert image to JPEG: {e}")
-                continue
+    # Output motion photo filename will be basename.jpg
+    out_file = output / (pr.base + ".jpg")
+    if out_file.exists() and not overwrite:
+        log.info(f"Skipping existing: {out_file}")
+        return PAIR_SKIPPED
 
-            # Output motion photo filename will be basename.jpg
-            out_file = output / (pr.base + ".jpg")
-            if out_file.exists() and not overwrite:
-                log.info(f"Skipping existing: {out_file}")
-                continue
-            mux.convert(jpeg, pr.video, output)
-            migrated += 1
-
-    # Copy remaining files as-is
-    def _copy_all(paths: List[Path]):
-        nonlocal copied
-        for p in paths:
-            dest = output / p.name
-            if dest.exists():
-                # Avoid clobbering a just-created Motion Photo; if names collide, keep existing
-                continue
-            shutil.copy2(p, dest)
-            copied += 1
+    if os.path.splitext(pr.image)[1].lower() in {".jpg", ".jpeg"}:
+        # Already JPEG: mux straight from the source, skipping the temp-file
+        # round trip (a copy plus a re-read) entirely. The output name is
+        # pinned to base.jpg so .jpeg sources normalize like everything else.
+        mux.convert(Path(pr.image), Path(pr.video), output, out_name=pr.base + ".jpg")
+        return PAIR_MIGRATED
 
-    _copy_all(images_only)
-    _copy_all(videos_only)
-    _copy_all(others)
+    tmpdir = tempfile.mkdtemp(prefix="motionphoto-", dir=_SCRATCH_DIR)
+    try:
+        try:
+            jpeg = convert_image_to_jpeg(Path(pr.image), Path(tmpdir))
+        except Exception as e:
+            log.error(f"Skipping pair {pr.base}: cannot convert image to JPEG: {e}")
+            return PAIR_FAILED
+        if isinstance(jpeg, bytes):
+            mux.convert_bytes(jpeg, Path(pr.video), output, pr.base + ".jpg")
+        else:
+            mux.convert(jpeg, Path(pr.video), output)
+        return PAIR_MIGRATED
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def perform_migration(pairs: List[Pair], images_only: List[str], videos_only: List[str], others: List[str], output: Path, overwrite: bool = True):
+    ensure_dir(output)
+    migrated = 0
+    copied = 0
+
+    if pairs:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count(), initializer=_init_worker
+        ) as ex:
+            futures = [ex.submit(_process_pair, pr, output, overwrite) for pr in pairs]
+            for fut in concurrent.futures.as_completed(futures):
+                if fut.result() == PAIR_MIGRATED:
+                    migrated += 1
+
+    # Copy remaining files as-is. Collisions with just-created Motion Photos
+    # (and duplicate basenames across subdirectories) are resolved serially
+    # here, before any submission, so the threaded phase only ever sees
+    # unique destinations — no check-then-act races between workers.
+    seen = {pr.base + ".jpg" for pr in pairs}
+    to_copy: List[str] = []
+    for p in itertools.chain(images_only, videos_only, others):
+        name = os.path.basename(p)
+        if name in seen:
+            continue
+        seen.add(name)
+        to_copy.append(p)
+
+    def _copy_one(p: str) -> int:
+        dest = output / os.path.basename(p)
+        if not overwrite and dest.exists():
+            return 0
+        _copy_file(p, dest)
+        return 1
+
+    # Copies are I/O-bound and release the GIL, so one thread pool across
+    # all categories overlaps them with a single spin-up and result drain.
+    if to_copy:
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+            copied = sum(ex.map(_copy_one, to_copy))
 
     return migrated, copied
 
@@ -236,11 +543,10 @@ def main():
 
     logging.basicConfig(level=(logging.INFO if args.verbose else logging.WARNING), stream=sys.stdout)
 
-    paths = scan_directory(args.input, args.recurse)
-    by_base, others = group_by_basename(paths)
+    by_base, others, by_ext = scan_and_group(args.input, args.recurse)
     pairs, images_only, videos_only, ambiguous = build_pairs(by_base)
 
-    summarize(paths, pairs, images_only, videos_only, others, ambiguous)
+    summarize(by_ext, pairs, images_only, videos_only, others, ambiguous)
 
     if args.dry_run and not args.yes:
         return 0